@@ -1,9 +1,99 @@
+from functools import lru_cache
+from math import pi, exp, pow as math_pow
+
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is not available in Pyodide - run the kernel as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Unit conversions (mm → m, g/cm³ → kg/m³, Pa → kPa) folded into the formula
+# constants, so the kernel works directly on the mm-based inputs
+_SHEAR_COEFF = 4.0 * 2000.0**3 / pi  # shear_rate = K·Q / t³
+_REYNOLDS_COEFF = 2.0 * 1000.0 * 2000.0 / pi  # Re = K·ρ·Q / (t·μ)
+_PRESSURE_COEFF = 8.0 * 2000.0**4 / (pi * 1000.0 * 1000.0)  # ΔP[kPa] = K·f(n)·μ·L·Q / t⁴
+_INJECTION_TIME_COEFF = pi / (2000.0**2 * 1000.0)  # t_inj = K·t²·L / Q
+
+# Warning messages, indexed by bit position in the kernel's warning mask
+WARNING_MESSAGES = (
+    "Flow is turbulent (Re > 2300) - consider reducing flow rate",
+    "High shear rate may affect material properties",
+    "High viscosity may require increased pressure",
+)
+
+def _profile_pressure(total_pressure, distance, length):
+    """Pressure at a distance along the pipe, for scalars or arrays (linear drop)"""
+    return total_pressure * (1.0 - distance / length)
+
 class ValidationError(Exception):
     """Custom exception for input validation errors"""
     pass
 
+@njit(cache=True, fastmath=True)
+def _core_calc(pipe_length, pipe_thickness, temperature, flow_rate, viscosity, density,
+               arrhenius_coeff, ref_temp_k_inv, power_law_exp, pressure_coeff):
+    """
+    Numeric core of PolyurethaneCalculator.calculate
+    
+    Takes the same units as calculate() and returns a tuple of
+    (shear_rate, apparent_viscosity, reynolds, pressure_drop_kpa, injection_time,
+    warning_mask), where bit i of warning_mask selects WARNING_MESSAGES[i]
+    """
+    # Powers of the pipe thickness, shared between the formulas below
+    t2 = pipe_thickness * pipe_thickness
+    t3 = t2 * pipe_thickness
+    t4 = t2 * t2
+    
+    # Calculate shear rate
+    shear_rate = _SHEAR_COEFF * flow_rate / t3
+    
+    # Calculate temperature factor (Arrhenius equation)
+    temp_k = temperature + 273.15  # Convert to Kelvin
+    temp_factor = exp(arrhenius_coeff * (1.0/temp_k - ref_temp_k_inv))
+    
+    # Calculate apparent viscosity with Power Law model
+    base_viscosity = viscosity * 0.001  # Convert from cP to Pa·s
+    apparent_viscosity = base_viscosity * temp_factor * math_pow(shear_rate, power_law_exp)
+    
+    # Calculate Reynolds number
+    reynolds = _REYNOLDS_COEFF * density * flow_rate / (pipe_thickness * apparent_viscosity)
+    
+    # Calculate pressure drop in kPa using modified Hagen-Poiseuille
+    pressure_drop_kpa = pressure_coeff * apparent_viscosity * pipe_length * flow_rate / t4
+    
+    # Calculate optimal injection time
+    injection_time = _INJECTION_TIME_COEFF * t2 * pipe_length / flow_rate  # seconds
+    
+    # Encode warnings as a bitmask (see WARNING_MESSAGES)
+    warning_mask = (int(reynolds > 2300)
+                    | (int(shear_rate > 1000) << 1)
+                    | (int(apparent_viscosity > 1.0) << 2))
+    
+    return (shear_rate, apparent_viscosity, reynolds, pressure_drop_kpa, injection_time,
+            warning_mask)
+
+try:
+    # Compiled kernel from _pu_kernel.pyx, built for server-side use
+    from _pu_kernel import pu_core as _core
+except ImportError:
+    # Not built, or running in Pyodide - use the Python kernel
+    _core = _core_calc
+
+@lru_cache(maxsize=128)
+def _calculate_cached(pipe_length, pipe_thickness, temperature, flow_rate, viscosity, density,
+                      arrhenius_coeff, ref_temp_k_inv, power_law_exp, pressure_coeff):
+    """
+    Memoized numeric kernel for repeated identical inputs
+    
+    UI workflows often resubmit the same parameters, so cache the kernel
+    output keyed on the (hashable) scalar arguments.
+    """
+    return _core(pipe_length, pipe_thickness, temperature, flow_rate, viscosity, density,
+                 arrhenius_coeff, ref_temp_k_inv, power_law_exp, pressure_coeff)
+
 class PolyurethaneCalculator:
     """
     Calculator for polyurethane injection parameters optimized for Pyodide
@@ -11,31 +101,137 @@ class PolyurethaneCalculator:
     This version is streamlined for running in the browser via Pyodide
     """
     
+    __slots__ = (
+        "_activation_energy", "_gas_constant", "_power_law_index",
+        "_arrhenius_coeff", "_ref_temp_k_inv",
+        "_power_law_exp", "_power_law_pressure_factor", "_pressure_coeff",
+    )
+    
     def __init__(self):
         """Initialize calculator with constants for Ecofoam materials"""
         # Constants for fluid dynamics calculations
-        self.activation_energy = 50000.0  # J/mol - Activation energy for Arrhenius equation
-        self.gas_constant = 8.314  # J/(mol·K) - Universal gas constant
-        self.power_law_index = 0.85  # Dimensionless - For shear-thinning behavior
+        self._activation_energy = 50000.0  # J/mol - Activation energy for Arrhenius equation
+        self._gas_constant = 8.314  # J/(mol·K) - Universal gas constant
+        self._power_law_index = 0.85  # Dimensionless - For shear-thinning behavior
+        self._ref_temp_k_inv = 1.0 / (25.0 + 273.15)  # 1/K - Reference temperature 25°C
+        
+        self._arrhenius_coeff = self._arrhenius_terms(self._activation_energy,
+                                                      self._gas_constant)
+        (self._power_law_exp, self._power_law_pressure_factor,
+         self._pressure_coeff) = self._power_law_terms(self._power_law_index)
+    
+    @staticmethod
+    def _arrhenius_terms(activation_energy, gas_constant):
+        """Precomputed Arrhenius coefficient E_a / R in K"""
+        return activation_energy / gas_constant
+    
+    @staticmethod
+    def _power_law_terms(n):
+        """Precomputed Power Law terms: exponent, pressure factor and pressure coefficient"""
+        power_law_exp = n - 1.0  # Exponent of the shear-thinning term
+        pressure_factor = (3.0*n + 1.0)/(4.0*n)  # Pressure drop correction
+        return power_law_exp, pressure_factor, _PRESSURE_COEFF * pressure_factor
+    
+    # The setters compute the derived terms before assigning anything, so a
+    # failing update (e.g. power_law_index = 0) leaves the calculator unchanged
+    
+    @property
+    def activation_energy(self):
+        """Activation energy for Arrhenius equation in J/mol"""
+        return self._activation_energy
+    
+    @activation_energy.setter
+    def activation_energy(self, value):
+        coeff = self._arrhenius_terms(value, self._gas_constant)
+        self._activation_energy = value
+        self._arrhenius_coeff = coeff
+    
+    @property
+    def gas_constant(self):
+        """Universal gas constant in J/(mol·K)"""
+        return self._gas_constant
+    
+    @gas_constant.setter
+    def gas_constant(self, value):
+        coeff = self._arrhenius_terms(self._activation_energy, value)
+        self._gas_constant = value
+        self._arrhenius_coeff = coeff
+    
+    @property
+    def power_law_index(self):
+        """Power Law index (dimensionless) for shear-thinning behavior"""
+        return self._power_law_index
+    
+    @power_law_index.setter
+    def power_law_index(self, value):
+        terms = self._power_law_terms(value)
+        self._power_law_index = value
+        (self._power_law_exp, self._power_law_pressure_factor,
+         self._pressure_coeff) = terms
     
     def validate_inputs(self, pipe_length, pipe_thickness, temperature, flow_rate, 
                       viscosity, density):
         """Validate input parameters against physical constraints"""
-        if pipe_length < 50:
-            raise ValidationError("Pipe length must be at least 50mm")
-        if pipe_thickness <= 0:
-            raise ValidationError("Pipe thickness must be positive")
-        if not (5 <= temperature <= 40):
-            raise ValidationError("Temperature must be between 5°C and 40°C")
-        if flow_rate <= 0:
-            raise ValidationError("Flow rate must be positive")
-        if viscosity <= 0:
-            raise ValidationError("Viscosity must be positive")
-        if density <= 0:
-            raise ValidationError("Density must be positive")
+        # Fast path: valid inputs pass a single short-circuit check
+        if (pipe_length >= 50 and pipe_thickness > 0 and 5 <= temperature <= 40
+                and flow_rate > 0 and viscosity > 0 and density > 0):
+            return
+        
+        checks = (
+            (pipe_length >= 50, "Pipe length must be at least 50mm"),
+            (pipe_thickness > 0, "Pipe thickness must be positive"),
+            (5 <= temperature <= 40, "Temperature must be between 5°C and 40°C"),
+            (flow_rate > 0, "Flow rate must be positive"),
+            (viscosity > 0, "Viscosity must be positive"),
+            (density > 0, "Density must be positive"),
+        )
+        for ok, message in checks:
+            if not ok:
+                raise ValidationError(message)
+    
+    def _generate_pressure_profile(self, total_pressure, length, num_points=20):
+        """
+        Generate a linear pressure profile along the pipe
+        
+        Args:
+            total_pressure: Pressure drop over the whole pipe in kPa
+            length: Length of the pipe in mm
+            num_points: Number of points in the profile (default: 20)
+            
+        Returns:
+            Array of shape (num_points, 2) with distance and pressure columns
+        """
+        distance = np.linspace(0.0, length, num_points)
+        pressure = _profile_pressure(total_pressure, distance, length)
+        return np.stack([distance, pressure], axis=1)
+    
+    def _iter_pressure_profile(self, total_pressure, length, num_points=20):
+        """
+        Lazily generate a linear pressure profile along the pipe
+        
+        Same points as _generate_pressure_profile, yielded one at a time for
+        consumers that only iterate the profile once (CSV export, plotting).
+        
+        Args:
+            total_pressure: Pressure drop over the whole pipe in kPa
+            length: Length of the pipe in mm
+            num_points: Number of points in the profile (default: 20)
+            
+        Yields:
+            {"distance", "pressure"} points
+        """
+        # Match np.linspace: a single point sits at 0 and the last point is exactly length
+        step = length / (num_points - 1) if num_points > 1 else 0.0
+        for i in range(num_points):
+            if i == num_points - 1 and num_points > 1:
+                distance = length
+            else:
+                distance = i * step
+            yield {"distance": distance,
+                   "pressure": _profile_pressure(total_pressure, distance, length)}
     
     def calculate(self, pipe_length, pipe_thickness, temperature, flow_rate, 
-                viscosity=350.0, density=1.12):
+                viscosity=350.0, density=1.12, lazy=False):
         """
         Calculate polyurethane injection parameters
         
@@ -46,78 +242,52 @@ class PolyurethaneCalculator:
             flow_rate: Volumetric flow rate in m³/s
             viscosity: Initial viscosity at 25°C in cP (default: 350.0)
             density: Material density in g/cm³ (default: 1.12)
+            lazy: Return the pressure profile as a generator of points instead
+                of an array (default: False)
             
         Returns:
-            Dictionary with calculation results
+            Dictionary with unrounded calculation results (see format_results)
         """
         try:
             # Validate inputs
             self.validate_inputs(pipe_length, pipe_thickness, temperature, flow_rate, 
                                viscosity, density)
             
-            # Convert units to SI
-            radius = pipe_thickness / 2000  # mm to m
-            length = pipe_length / 1000  # mm to m
-            density_kg_m3 = density * 1000  # g/cm³ to kg/m³
-            
-            # Calculate shear rate
-            shear_rate = (4 * flow_rate) / (np.pi * radius**3)
-            
-            # Calculate temperature factor (Arrhenius equation)
-            temp_k = temperature + 273.15  # Convert to Kelvin
-            ref_temp_k = 25 + 273.15  # Reference temperature 25°C in Kelvin
-            temp_factor = np.exp((self.activation_energy / self.gas_constant) * 
-                               (1/temp_k - 1/ref_temp_k))
-            
-            # Calculate apparent viscosity with Power Law model
-            base_viscosity = viscosity * 0.001  # Convert from cP to Pa·s
-            apparent_viscosity = base_viscosity * temp_factor * shear_rate**(self.power_law_index - 1)
-            
-            # Calculate Reynolds number
-            velocity = flow_rate / (np.pi * radius**2)
-            reynolds = (2 * radius * velocity * density_kg_m3) / apparent_viscosity
-            
-            # Calculate pressure drop using modified Hagen-Poiseuille
-            n = self.power_law_index
-            pressure_drop = ((8 * apparent_viscosity * length * flow_rate) / 
-                          (np.pi * radius**4)) * ((3*n + 1)/(4*n))
-            
-            # Convert pressure to kPa for display
-            pressure_drop_kpa = pressure_drop / 1000
+            # Plain floats give hashable cache keys and a single kernel specialization
+            pipe_length = float(pipe_length)
+            pipe_thickness = float(pipe_thickness)
+            temperature = float(temperature)
+            flow_rate = float(flow_rate)
+            viscosity = float(viscosity)
+            density = float(density)
             
-            # Generate pressure profile
-            pressure_profile = []
-            for i in range(20):
-                distance = (i * pipe_length) / 19
-                pressure = pressure_drop_kpa * (1 - distance/pipe_length)
-                pressure_profile.append({
-                    "distance": round(distance, 1),
-                    "pressure": round(pressure, 2)
-                })
+            # Run the numeric kernel
+            (shear_rate, apparent_viscosity, reynolds,
+             pressure_drop_kpa, injection_time, warning_mask) = _calculate_cached(
+                pipe_length, pipe_thickness, temperature, flow_rate, viscosity, density,
+                self._arrhenius_coeff, self._ref_temp_k_inv, self._power_law_exp,
+                self._pressure_coeff)
             
-            # Calculate optimal injection time
-            pipe_volume = np.pi * radius**2 * length  # m³
-            injection_time = pipe_volume / flow_rate  # seconds
+            # Generate pressure profile as a (num_points, 2) array, or lazily as points
+            if lazy:
+                pressure_profile = self._iter_pressure_profile(pressure_drop_kpa, pipe_length)
+            else:
+                pressure_profile = self._generate_pressure_profile(pressure_drop_kpa, pipe_length)
             
             # Determine flow regime
             flow_regime = "laminar" if reynolds < 2300 else "turbulent"
             
             # Generate warnings
-            warnings = []
-            if reynolds > 2300:
-                warnings.append("Flow is turbulent (Re > 2300) - consider reducing flow rate")
-            if shear_rate > 1000:
-                warnings.append("High shear rate may affect material properties")
-            if apparent_viscosity > 1.0:
-                warnings.append("High viscosity may require increased pressure")
+            warnings = [message for i, message in enumerate(WARNING_MESSAGES)
+                        if warning_mask & (1 << i)]
             
             # Prepare results
             return {
-                "required_pressure": round(pressure_drop_kpa, 2),  # kPa
-                "shear_rate": round(shear_rate, 2),  # s⁻¹
-                "apparent_viscosity": round(apparent_viscosity, 4),  # Pa·s
-                "reynolds_number": round(reynolds, 2),
-                "optimal_injection_time": round(injection_time, 2),  # s
+                "required_pressure": pressure_drop_kpa,  # kPa
+                "shear_rate": shear_rate,  # s⁻¹
+                "apparent_viscosity": apparent_viscosity,  # Pa·s
+                "reynolds_number": reynolds,
+                "optimal_injection_time": injection_time,  # s
                 "pressure_profile": pressure_profile,
                 "flow_regime": flow_regime,
                 "warnings": warnings
@@ -129,6 +299,124 @@ class PolyurethaneCalculator:
         except Exception as e:
             # Provide more context for other errors
             raise Exception(f"Calculation error: {str(e)}")
+    
+    def calculate_batch(self, pipe_length, pipe_thickness, temperature, flow_rate, 
+                        viscosity=350.0, density=1.12):
+        """
+        Calculate injection parameters for many inputs at once
+        
+        Accepts scalars or array-likes for every argument and broadcasts them
+        against each other, e.g. for temperature × flow rate sweeps.
+        
+        Args:
+            pipe_length: Length of the injection pipe in mm
+            pipe_thickness: Thickness/diameter of the pipe in mm
+            temperature: Process temperature in °C
+            flow_rate: Volumetric flow rate in m³/s
+            viscosity: Initial viscosity at 25°C in cP (default: 350.0)
+            density: Material density in g/cm³ (default: 1.12)
+            
+        Returns:
+            Dictionary of NumPy arrays with the numeric calculation results and
+            a warning_mask, where bit i selects WARNING_MESSAGES[i]
+        """
+        # Broadcast all inputs to a common shape
+        (pipe_length, pipe_thickness, temperature, flow_rate,
+         viscosity, density) = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (
+                pipe_length, pipe_thickness, temperature, flow_rate, viscosity, density)))
+        
+        # Validate inputs
+        if not np.all(pipe_length >= 50):
+            raise ValidationError("Pipe length must be at least 50mm")
+        if not np.all(pipe_thickness > 0):
+            raise ValidationError("Pipe thickness must be positive")
+        if not np.all((temperature >= 5) & (temperature <= 40)):
+            raise ValidationError("Temperature must be between 5°C and 40°C")
+        if not np.all(flow_rate > 0):
+            raise ValidationError("Flow rate must be positive")
+        if not np.all(viscosity > 0):
+            raise ValidationError("Viscosity must be positive")
+        if not np.all(density > 0):
+            raise ValidationError("Density must be positive")
+        
+        # Powers of the pipe thickness, shared between the formulas below
+        t2 = pipe_thickness * pipe_thickness
+        t3 = t2 * pipe_thickness
+        t4 = t2 * t2
+        
+        # Calculate shear rate
+        shear_rate = _SHEAR_COEFF * flow_rate / t3
+        
+        # Calculate temperature factor (Arrhenius equation)
+        temp_k = temperature + 273.15  # Convert to Kelvin
+        temp_factor = np.exp(self._arrhenius_coeff * (1.0/temp_k - self._ref_temp_k_inv))
+        
+        # Calculate apparent viscosity with Power Law model
+        base_viscosity = viscosity * 0.001  # Convert from cP to Pa·s
+        apparent_viscosity = base_viscosity * temp_factor * np.power(shear_rate, self._power_law_exp)
+        
+        # Calculate Reynolds number
+        reynolds = _REYNOLDS_COEFF * density * flow_rate / (pipe_thickness * apparent_viscosity)
+        
+        # Calculate pressure drop in kPa using modified Hagen-Poiseuille
+        pressure_drop_kpa = (self._pressure_coeff * apparent_viscosity * pipe_length * flow_rate
+                             / t4)
+        
+        # Calculate optimal injection time
+        injection_time = _INJECTION_TIME_COEFF * t2 * pipe_length / flow_rate  # seconds
+        
+        # Encode warnings as a bitmask per element (see WARNING_MESSAGES)
+        warning_mask = ((reynolds > 2300).astype(np.uint8)
+                        | ((shear_rate > 1000).astype(np.uint8) << 1)
+                        | ((apparent_viscosity > 1.0).astype(np.uint8) << 2))
+        
+        return {
+            "required_pressure": pressure_drop_kpa,  # kPa
+            "shear_rate": shear_rate,  # s⁻¹
+            "apparent_viscosity": apparent_viscosity,  # Pa·s
+            "reynolds_number": reynolds,
+            "optimal_injection_time": injection_time,  # s
+            "warning_mask": warning_mask
+        }
+
+def format_results(results):
+    """
+    Round calculation results from PolyurethaneCalculator.calculate for display
+    
+    Args:
+        results: Dictionary returned by calculate()
+        
+    Returns:
+        Copy of the results with numeric values rounded and the pressure
+        profile as a list of {"distance", "pressure"} points
+    """
+    formatted = dict(results)
+    formatted["required_pressure"] = round(results["required_pressure"], 2)
+    formatted["shear_rate"] = round(results["shear_rate"], 2)
+    formatted["apparent_viscosity"] = round(results["apparent_viscosity"], 4)
+    formatted["reynolds_number"] = round(results["reynolds_number"], 2)
+    formatted["optimal_injection_time"] = round(results["optimal_injection_time"], 2)
+    
+    # The profile is an array of rows, or a generator of points with lazy=True
+    profile = results["pressure_profile"]
+    if isinstance(profile, np.ndarray):
+        points = profile.tolist()
+    else:
+        points = ((point["distance"], point["pressure"]) for point in profile)
+    formatted["pressure_profile"] = [
+        {"distance": round(d, 1), "pressure": round(p, 2)} for d, p in points
+    ]
+    return formatted
+
+# Blowing agent data, stored as parallel arrays indexed through AGENT_INDEX
+# (agent name → index, public for use with calculate_environmental_impact_batch)
+AGENT_INDEX = {"HFC": 0, "HCFC": 1, "Pentane": 2, "HFO": 3, "Ecomate": 4}
+_GWP = np.array([1430.0, 725.0, 5.0, 1.0, 0.0])
+_ODP = np.array([0.0, 0.07, 0.0, 0.0, 0.0])
+_LAMBDA = np.array([0.022, 0.023, 0.024, 0.022, 0.019])
+_COST = np.array([4.50, 4.20, 3.80, 5.20, 3.95])
+_ECOMATE = AGENT_INDEX["Ecomate"]
 
 # Environmental impact calculation function
 def calculate_environmental_impact(agent_type, annual_consumption):
@@ -142,32 +430,71 @@ def calculate_environmental_impact(agent_type, annual_consumption):
     Returns:
         Dictionary with environmental impact metrics
     """
-    # Blowing agent data
-    blowing_agent_data = {
-        "HFC": {"gwp": 1430, "odp": 0, "lambda": 0.022, "cost": 4.50},
-        "HCFC": {"gwp": 725, "odp": 0.07, "lambda": 0.023, "cost": 4.20},
-        "Pentane": {"gwp": 5, "odp": 0, "lambda": 0.024, "cost": 3.80},
-        "HFO": {"gwp": 1, "odp": 0, "lambda": 0.022, "cost": 5.20},
-        "Ecomate": {"gwp": 0, "odp": 0, "lambda": 0.019, "cost": 3.95}
-    }
-    
-    # Get properties of current agent and ecomate
-    current_agent = blowing_agent_data.get(agent_type, blowing_agent_data["HFC"])
-    ecomate = blowing_agent_data["Ecomate"]
+    # Get index of current agent, defaulting to HFC
+    i = AGENT_INDEX.get(agent_type, AGENT_INDEX["HFC"])
+    current_lambda = _LAMBDA.item(i)
     
     # Calculate impact metrics
-    co2_reduction = (current_agent["gwp"] * annual_consumption) / 1000  # tons
-    thermal_improvement = ((current_agent["lambda"] - ecomate["lambda"]) / 
-                          current_agent["lambda"]) * 100  # percentage
-    cost_savings = (current_agent["cost"] - ecomate["cost"]) * annual_consumption  # currency
+    co2_reduction = (_GWP.item(i) * annual_consumption) / 1000  # tons
+    thermal_improvement = ((current_lambda - _LAMBDA.item(_ECOMATE)) / 
+                          current_lambda) * 100  # percentage
+    cost_savings = (_COST.item(i) - _COST.item(_ECOMATE)) * annual_consumption  # currency
     
     return {
         "co2_reduction": round(co2_reduction, 2),
         "thermal_improvement": round(thermal_improvement, 2),
         "cost_savings": round(cost_savings, 2),
-        "odp_reduction": current_agent["odp"] * annual_consumption
+        "odp_reduction": _ODP.item(i) * annual_consumption
+    }
+
+def calculate_environmental_impact_batch(agent_indices, annual_consumption):
+    """
+    Calculate environmental impact for many agent/consumption pairs at once
+    
+    Args:
+        agent_indices: Array of blowing agent indices (see AGENT_INDEX)
+        annual_consumption: Array of annual consumptions in kg, broadcast
+            against agent_indices
+        
+    Returns:
+        Dictionary of NumPy arrays with environmental impact metrics
+        
+    Raises:
+        ValidationError: If an agent index is out of range
+    """
+    idx, consumption = np.broadcast_arrays(np.asarray(agent_indices, dtype=np.intp),
+                                           np.asarray(annual_consumption, dtype=float))
+    if np.any((idx < 0) | (idx >= len(_GWP))):
+        raise ValidationError(f"Agent indices must be between 0 and {len(_GWP) - 1} (see AGENT_INDEX)")
+    current_lambda = _LAMBDA[idx]
+    
+    return {
+        "co2_reduction": (_GWP[idx] * consumption) / 1000,  # tons
+        "thermal_improvement": ((current_lambda - _LAMBDA[_ECOMATE]) / 
+                               current_lambda) * 100,  # percentage
+        "cost_savings": (_COST[idx] - _COST[_ECOMATE]) * consumption,  # currency
+        "odp_reduction": _ODP[idx] * consumption
     }
 
+def calculate_environmental_impact_matrix(agents, consumptions):
+    """
+    Calculate environmental impact for every combination of agents and consumptions
+    
+    Args:
+        agents: List of blowing agent types (HFC, HCFC, etc.)
+        consumptions: 1-D array of annual consumptions in kg
+        
+    Returns:
+        Dictionary of arrays with shape (len(agents), len(consumptions))
+    """
+    # Unknown agents fall back to HFC, as in calculate_environmental_impact
+    idx = np.array([AGENT_INDEX.get(agent, AGENT_INDEX["HFC"]) for agent in agents],
+                   dtype=np.intp)
+    
+    # Broadcast agents (column vector) against consumptions (row vector)
+    return calculate_environmental_impact_batch(
+        idx[:, None], np.asarray(consumptions, dtype=float)[None, :])
+
 # Example usage
 if __name__ == "__main__":
     calculator = PolyurethaneCalculator()
@@ -181,9 +508,9 @@ if __name__ == "__main__":
     density = 1.12  # g/cm³
     
     # Calculate parameters
-    result = calculator.calculate(
+    result = format_results(calculator.calculate(
         pipe_length, pipe_thickness, temperature, flow_rate, viscosity, density
-    )
+    ))
     
     # Print results
     print(f"Required pressure: {result['required_pressure']} kPa")
@@ -5,6 +5,8 @@
  * then provides functions to call the Python code from JavaScript.
  */
 import { loadPyodide } from 'pyodide';
+// Python calculator source, bundled as a string by Vite
+import calculatorSource from './polyurethane_calculator.py?raw';
 
 // Types for calculation parameters and results
 export interface ProcessParameters {
@@ -58,165 +60,6 @@ export class ValidationError extends Error {
 let pyodide: any = null;
 let isInitializing = false;
 let initializationPromise: Promise<void> | null = null;
-let calculatorCode: string | null = null;
-
-/**
- * Get the Python calculator code
- * In a production environment, this would fetch from a file
- */
-function getPythonCalculatorCode(): string {
-  // This is a simplified version that returns the code directly
-  // In production, you would fetch this from a file
-  return `
-import numpy as np
-
-class ValidationError(Exception):
-    """Custom exception for input validation errors"""
-    pass
-
-class PolyurethaneCalculator:
-    """
-    Calculator for polyurethane injection parameters optimized for Pyodide
-    """
-    
-    def __init__(self):
-        """Initialize calculator with constants for Ecofoam materials"""
-        # Constants for fluid dynamics calculations
-        self.activation_energy = 50000.0  # J/mol - Activation energy for Arrhenius equation
-        self.gas_constant = 8.314  # J/(mol·K) - Universal gas constant
-        self.power_law_index = 0.85  # Dimensionless - For shear-thinning behavior
-    
-    def validate_inputs(self, pipe_length, pipe_thickness, temperature, flow_rate, 
-                      viscosity, density):
-        """Validate input parameters against physical constraints"""
-        if pipe_length < 50:
-            raise ValidationError("Pipe length must be at least 50mm")
-        if pipe_thickness <= 0:
-            raise ValidationError("Pipe thickness must be positive")
-        if not (5 <= temperature <= 40):
-            raise ValidationError("Temperature must be between 5°C and 40°C")
-        if flow_rate <= 0:
-            raise ValidationError("Flow rate must be positive")
-        if viscosity <= 0:
-            raise ValidationError("Viscosity must be positive")
-        if density <= 0:
-            raise ValidationError("Density must be positive")
-    
-    def calculate(self, pipe_length, pipe_thickness, temperature, flow_rate, 
-                viscosity=350.0, density=1.12):
-        """Calculate polyurethane injection parameters"""
-        try:
-            # Validate inputs
-            self.validate_inputs(pipe_length, pipe_thickness, temperature, flow_rate, 
-                               viscosity, density)
-            
-            # Convert units to SI
-            radius = pipe_thickness / 2000  # mm to m
-            length = pipe_length / 1000  # mm to m
-            density_kg_m3 = density * 1000  # g/cm³ to kg/m³
-            
-            # Calculate shear rate
-            shear_rate = (4 * flow_rate) / (np.pi * radius**3)
-            
-            # Calculate temperature factor (Arrhenius equation)
-            temp_k = temperature + 273.15  # Convert to Kelvin
-            ref_temp_k = 25 + 273.15  # Reference temperature 25°C in Kelvin
-            temp_factor = np.exp((self.activation_energy / self.gas_constant) * 
-                               (1/temp_k - 1/ref_temp_k))
-            
-            # Calculate apparent viscosity with Power Law model
-            base_viscosity = viscosity * 0.001  # Convert from cP to Pa·s
-            apparent_viscosity = base_viscosity * temp_factor * shear_rate**(self.power_law_index - 1)
-            
-            # Calculate Reynolds number
-            velocity = flow_rate / (np.pi * radius**2)
-            reynolds = (2 * radius * velocity * density_kg_m3) / apparent_viscosity
-            
-            # Calculate pressure drop using modified Hagen-Poiseuille
-            n = self.power_law_index
-            pressure_drop = ((8 * apparent_viscosity * length * flow_rate) / 
-                          (np.pi * radius**4)) * ((3*n + 1)/(4*n))
-            
-            # Convert pressure to kPa for display
-            pressure_drop_kpa = pressure_drop / 1000
-            
-            # Generate pressure profile
-            pressure_profile = []
-            for i in range(20):
-                distance = (i * pipe_length) / 19
-                pressure = pressure_drop_kpa * (1 - distance/pipe_length)
-                pressure_profile.append({
-                    "distance": round(distance, 1),
-                    "pressure": round(pressure, 2)
-                })
-            
-            # Calculate optimal injection time
-            pipe_volume = np.pi * radius**2 * length  # m³
-            injection_time = pipe_volume / flow_rate  # seconds
-            
-            # Determine flow regime
-            flow_regime = "laminar" if reynolds < 2300 else "turbulent"
-            
-            # Generate warnings
-            warnings = []
-            if reynolds > 2300:
-                warnings.append("Flow is turbulent (Re > 2300) - consider reducing flow rate")
-            if shear_rate > 1000:
-                warnings.append("High shear rate may affect material properties")
-            if apparent_viscosity > 1.0:
-                warnings.append("High viscosity may require increased pressure")
-            
-            # Prepare results
-            return {
-                "required_pressure": round(pressure_drop_kpa, 2),  # kPa
-                "shear_rate": round(shear_rate, 2),  # s⁻¹
-                "apparent_viscosity": round(apparent_viscosity, 4),  # Pa·s
-                "reynolds_number": round(reynolds, 2),
-                "optimal_injection_time": round(injection_time, 2),  # s
-                "pressure_profile": pressure_profile,
-                "flow_regime": flow_regime,
-                "warnings": warnings
-            }
-            
-        except ValidationError as e:
-            # Re-raise validation errors
-            raise
-        except Exception as e:
-            # Provide more context for other errors
-            raise Exception(f"Calculation error: {str(e)}")
-
-# Environmental impact calculation function
-def calculate_environmental_impact(agent_type, annual_consumption):
-    """
-    Calculate environmental impact of switching to ecomate
-    """
-    # Blowing agent data
-    blowing_agent_data = {
-        "HFC": {"gwp": 1430, "odp": 0, "lambda": 0.022, "cost": 4.50},
-        "HCFC": {"gwp": 725, "odp": 0.07, "lambda": 0.023, "cost": 4.20},
-        "Pentane": {"gwp": 5, "odp": 0, "lambda": 0.024, "cost": 3.80},
-        "HFO": {"gwp": 1, "odp": 0, "lambda": 0.022, "cost": 5.20},
-        "Ecomate": {"gwp": 0, "odp": 0, "lambda": 0.019, "cost": 3.95}
-    }
-    
-    # Get properties of current agent and ecomate
-    current_agent = blowing_agent_data.get(agent_type, blowing_agent_data["HFC"])
-    ecomate = blowing_agent_data["Ecomate"]
-    
-    # Calculate impact metrics
-    co2_reduction = (current_agent["gwp"] * annual_consumption) / 1000  # tons
-    thermal_improvement = ((current_agent["lambda"] - ecomate["lambda"]) / 
-                          current_agent["lambda"]) * 100  # percentage
-    cost_savings = (current_agent["cost"] - ecomate["cost"]) * annual_consumption  # currency
-    
-    return {
-        "co2_reduction": round(co2_reduction, 2),
-        "thermal_improvement": round(thermal_improvement, 2),
-        "cost_savings": round(cost_savings, 2),
-        "odp_reduction": current_agent["odp"] * annual_consumption
-    }
-`
-}
 
 /**
  * Initialize Pyodide and load the calculator code
@@ -253,9 +96,9 @@ export async function initializePyodide(): Promise<void> {
         await pyodide.loadPackage("numpy");
         
         console.log('Loading calculator code...');
-        // Load the polyurethane calculator code
-        calculatorCode = getPythonCalculatorCode();
-        await pyodide.runPython(calculatorCode);
+        // Install the calculator as a module and import its public names
+        pyodide.FS.writeFile('polyurethane_calculator.py', calculatorSource);
+        await pyodide.runPython('from polyurethane_calculator import *');
         
         console.log('Pyodide initialization completed successfully');
       } catch (err) {
@@ -276,6 +119,34 @@ export async function initializePyodide(): Promise<void> {
   return initializationPromise;
 }
 
+/**
+ * Round a number to a fixed number of decimals
+ */
+function roundTo(value: number, digits: number): number {
+  return parseFloat(value.toFixed(digits));
+}
+
+/**
+ * Round calculation results for display
+ * 
+ * The Python calculator returns unrounded values, so rounding happens
+ * here at the display boundary.
+ */
+function formatResults(results: CalculationResults): CalculationResults {
+  return {
+    ...results,
+    required_pressure: roundTo(results.required_pressure, 2),
+    shear_rate: roundTo(results.shear_rate, 2),
+    apparent_viscosity: roundTo(results.apparent_viscosity, 4),
+    reynolds_number: roundTo(results.reynolds_number, 2),
+    optimal_injection_time: roundTo(results.optimal_injection_time, 2),
+    pressure_profile: results.pressure_profile.map(point => ({
+      distance: roundTo(point.distance, 1),
+      pressure: roundTo(point.pressure, 2)
+    }))
+  };
+}
+
 /**
  * Fallback calculation when Pyodide fails
  */
@@ -296,19 +167,23 @@ export function calculateParametersFallback(params: ProcessParameters): Calculat
   const refTempK = 25 + 273.15; // 25°C reference in Kelvin
   const tempFactor = Math.exp((activationEnergy / gasConstant) * (1/tempK - 1/refTempK));
   
+  // Powers of the radius, shared between the formulas below
+  const r2 = radius * radius;
+  const r3 = r2 * radius;
+  const r4 = r2 * r2;
+  
   // Calculate shear rate
-  const shearRate = (4 * params.flowRate) / (Math.PI * Math.pow(radius, 3));
+  const shearRate = (4 * params.flowRate) / (Math.PI * r3);
   
   // Calculate apparent viscosity with both temperature and shear effects
   const viscosityPas = viscosity * tempFactor * Math.pow(shearRate, powerLawIndex - 1);
   
-  // Calculate Reynolds number
-  const velocity = params.flowRate / (Math.PI * Math.pow(radius, 2));
-  const reynolds = (2 * radius * velocity * density) / viscosityPas;
+  // Calculate Reynolds number (mean velocity Q/(π r²) folded in)
+  const reynolds = (2 * density * params.flowRate) / (Math.PI * radius * viscosityPas);
   
   // Calculate pressure drop using modified Hagen-Poiseuille for Power Law fluid
   const pressureDrop = ((8 * viscosityPas * length * params.flowRate) / 
-                       (Math.PI * Math.pow(radius, 4))) * ((3*powerLawIndex + 1)/(4*powerLawIndex));
+                       (Math.PI * r4)) * ((3*powerLawIndex + 1)/(4*powerLawIndex));
   
   // Convert pressure to kPa for display
   const pressureDropKpa = pressureDrop / 1000;
@@ -317,14 +192,11 @@ export function calculateParametersFallback(params: ProcessParameters): Calculat
   const pressureProfile = Array.from({length: 20}, (_, i) => {
     const distance = (i * params.pipeLength) / 19;
     const pressure = pressureDropKpa * (1 - distance/params.pipeLength);
-    return { 
-      distance: parseFloat(distance.toFixed(1)), 
-      pressure: parseFloat(pressure.toFixed(2)) 
-    };
+    return { distance, pressure };
   });
   
   // Calculate injection time
-  const volume = Math.PI * Math.pow(radius, 2) * length;
+  const volume = Math.PI * r2 * length;
   const injectionTime = volume / params.flowRate;
   
   // Determine flow regime
@@ -345,16 +217,16 @@ export function calculateParametersFallback(params: ProcessParameters): Calculat
   // Add a note about using JavaScript fallback
   warnings.push("Using simplified JavaScript calculations (Pyodide not available)");
   
-  return {
-    required_pressure: parseFloat(pressureDropKpa.toFixed(2)),
-    shear_rate: parseFloat(shearRate.toFixed(2)),
-    apparent_viscosity: parseFloat(viscosityPas.toFixed(4)),
-    reynolds_number: parseFloat(reynolds.toFixed(2)),
-    optimal_injection_time: parseFloat(injectionTime.toFixed(2)),
+  return formatResults({
+    required_pressure: pressureDropKpa,
+    shear_rate: shearRate,
+    apparent_viscosity: viscosityPas,
+    reynolds_number: reynolds,
+    optimal_injection_time: injectionTime,
     pressure_profile: pressureProfile,
     flow_regime: flowRegime,
     warnings: warnings
-  };
+  });
 }
 
 /**
@@ -422,9 +294,15 @@ else:
       }
     }
     
-    // Get results and convert to JavaScript object
-    const results = pyodide.globals.get('results').toJs();
-    return results as CalculationResults;
+    // Get results, convert to a plain JavaScript object and round for display
+    const results = pyodide.globals.get('results').toJs({ dict_converter: Object.fromEntries });
+    
+    // The pressure profile arrives as rows of [distance, pressure]
+    const pressureProfile: PressurePoint[] = Array.from(
+      results.pressure_profile,
+      ([distance, pressure]: number[]) => ({ distance, pressure })
+    );
+    return formatResults({ ...results, pressure_profile: pressureProfile } as CalculationResults);
     
   } catch (err) {
     if (err instanceof ValidationError) {